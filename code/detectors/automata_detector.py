@@ -1,22 +1,138 @@
-from typing import List, Dict, Any
-from collections import defaultdict
-from .text_processor import TextProcessor
+import multiprocessing
+import threading
+from typing import List, Dict, Any, Optional, Tuple
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+import ahocorasick
+import numpy as np
+from .text_processor import TextProcessor, char_codes
+from utils.config import Config
+
+# Search backends selectable per automaton or with Config.AUTOMATON_BACKEND
+AUTOMATON_BACKENDS = ('native', 'compiled', 'python')
+
+def _scan(text_codes, transitions, out_ptr, out_ids):
+    """Walk the DFA over character codes, returning (end position, pattern id) per match
+    
+    Outputs are packed CSR-style: state s emits out_ids[out_ptr[s]:out_ptr[s + 1]].
+    """
+    # First pass counts matches so the result arrays are allocated exactly once
+    total = 0
+    state = 0
+    for position in range(text_codes.shape[0]):
+        state = transitions[state, text_codes[position]]
+        total += out_ptr[state + 1] - out_ptr[state]
+    
+    ends = np.empty(total, dtype=np.int64)
+    pattern_ids = np.empty(total, dtype=np.int32)
+    count = 0
+    state = 0
+    for position in range(text_codes.shape[0]):
+        state = transitions[state, text_codes[position]]
+        for k in range(out_ptr[state], out_ptr[state + 1]):
+            ends[count] = position
+            pattern_ids[count] = out_ids[k]
+            count += 1
+    return ends, pattern_ids
+
+@lru_cache(maxsize=None)
+def _compiled_scan():
+    """Return _scan compiled with Numba, or None when Numba is not installed
+    
+    Numba is imported only here, so processes using the other backends never
+    pay for loading it.
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    return njit(cache=True)(_scan)
+
+# Per-process TextProcessor for source extraction (also used in pool workers)
+_text_processor = None
+_source_pool = None
+_source_pool_lock = threading.Lock()
+
+def _extract_source_patterns(content: str, suspicious_hashes: np.ndarray, n: int = 6) -> Tuple[List[str], bool]:
+    """Return (candidate patterns, whether any pattern was extracted) for one source text"""
+    global _text_processor
+    if _text_processor is None:
+        _text_processor = TextProcessor()
+    
+    normalized_content = _text_processor.normalize_text(content)
+    if len(normalized_content) < 10:
+        return [], False
+    
+    patterns = _text_processor.create_ngrams(normalized_content, n=n)
+    # Keep only n-grams whose fingerprint also occurs in the suspicious text
+    shared = np.isin(_text_processor.ngram_hashes(normalized_content, n=n), suspicious_hashes)
+    
+    candidates = []
+    extracted = False
+    for pattern, is_shared in zip(patterns, shared.tolist()):
+        if len(pattern) >= 4:  # Minimum pattern length
+            extracted = True
+            if is_shared:
+                candidates.append(pattern)
+    
+    return candidates, extracted
+
+def _get_source_pool() -> ProcessPoolExecutor:
+    """Return the shared process pool for source extraction, creating it on first use"""
+    global _source_pool
+    if _source_pool is None:
+        with _source_pool_lock:
+            if _source_pool is None:
+                # spawn: forking a threaded web server process is not safe
+                _source_pool = ProcessPoolExecutor(
+                    max_workers=Config.DETECTION_WORKERS or None,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+    return _source_pool
 
 class AhoCorasickAutomaton:
     """Aho-Corasick algorithm for multiple pattern matching"""
     
-    def __init__(self):
+    def __init__(self, backend: Optional[str] = None):
         self.goto = {}
         self.fail = {}
-        self.output = defaultdict(list)
+        self.output = defaultdict(set)
         self.patterns = []
+        self.pattern_ids = {}
+        self.pattern_lengths = np.zeros(0, dtype=np.int64)
+        self.alphabet = None
+        self.transitions = None
+        self.out_ptr = None
+        self.out_ids = None
+        # "native" searches with pyahocorasick (C), "compiled" with the Numba scan
+        # over the tables above (the dict walk when Numba is missing), "python"
+        # with the dict walk; see Config.AUTOMATON_BACKEND
+        self.backend = backend or Config.AUTOMATON_BACKEND
+        if self.backend not in AUTOMATON_BACKENDS:
+            raise ValueError(f"Unknown automaton backend: {self.backend!r}")
+        self.native = None
     
     def build_automaton(self, patterns: List[str]):
         """Build the automaton from patterns"""
         self.patterns = patterns
+        # Matches refer to patterns by id: the index of their first occurrence
+        self.pattern_ids = {}
+        for pattern_id, pattern in enumerate(patterns):
+            self.pattern_ids.setdefault(pattern, pattern_id)
+        self.pattern_lengths = np.array([len(pattern) for pattern in patterns], dtype=np.int64)
         self.goto = {}
         self.fail = {}
-        self.output = defaultdict(list)
+        self.output = defaultdict(set)
+        self.alphabet = None
+        self.transitions = None
+        self.out_ptr = None
+        self.out_ids = None
+        self.native = None
+        
+        if self.backend == 'native':
+            self._build_native(patterns)
+            return
         
         # Start with state 0
         self.goto[0] = {}
@@ -39,11 +155,12 @@ class AhoCorasickAutomaton:
                     current_state = new_state
                     state_counter += 1
             
-            # Mark output for the final state of this pattern
-            self.output[current_state].append(pattern)
+            # Mark output (by pattern id) for the final state of this pattern
+            self.output[current_state].add(self.pattern_ids[pattern])
         
         # Build failure function using BFS - FIXED VERSION
-        queue = []
+        queue = deque()
+        bfs_order = [0]
         
         # Initialize failure for depth 1 states
         for char, next_state in self.goto[0].items():
@@ -52,7 +169,8 @@ class AhoCorasickAutomaton:
         
         # Process states in BFS order
         while queue:
-            current_state = queue.pop(0)
+            current_state = queue.popleft()
+            bfs_order.append(current_state)
             
             for char, next_state in self.goto[current_state].items():
                 queue.append(next_state)
@@ -65,36 +183,138 @@ class AhoCorasickAutomaton:
                 self.fail[next_state] = self.goto[fail_state].get(char, 0)
                 
                 # Merge outputs
-                self.output[next_state].extend(self.output[self.fail[next_state]])
+                self.output[next_state].update(self.output[self.fail[next_state]])
+        
+        # Freeze outputs into tuples, longest pattern first as the search emits them
+        lengths = self.pattern_lengths
+        self.output = {
+            state: tuple(sorted(ids, key=lambda pattern_id: -lengths[pattern_id]))
+            for state, ids in self.output.items() if ids
+        }
+        
+        if self.backend == 'compiled':
+            self._build_transition_table(state_counter, bfs_order)
+    
+    def _build_native(self, patterns: List[str]):
+        """Build the pyahocorasick automaton; each word maps to its pattern id"""
+        native = ahocorasick.Automaton()
+        for pattern, pattern_id in self.pattern_ids.items():
+            if pattern:
+                native.add_word(pattern, pattern_id)
+        if len(native):
+            native.make_automaton()
+            self.native = native
+    
+    def _build_transition_table(self, n_states: int, bfs_order: List[int]):
+        """Fold failure links into a dense DFA table for the compiled search"""
+        if _compiled_scan() is None:
+            return
+        
+        # Columns cover only the characters the patterns use (sorted by code
+        # point), plus one last column shared by every other character
+        alphabet = sorted({char for edges in self.goto.values() for char in edges})
+        columns = {char: column for column, char in enumerate(alphabet)}
+        
+        transitions = np.zeros((n_states, len(alphabet) + 1), dtype=np.int32)
+        for state in bfs_order:
+            # A missing edge behaves like the same edge from the failure state,
+            # which BFS order guarantees is already filled in
+            if state != 0:
+                transitions[state] = transitions[self.fail[state]]
+            for char, next_state in self.goto[state].items():
+                transitions[state, columns[char]] = next_state
+        
+        # Pack per-state outputs CSR-style
+        counts = np.zeros(n_states + 1, dtype=np.int32)
+        for state, ids in self.output.items():
+            counts[state + 1] = len(ids)
+        out_ptr = np.cumsum(counts, dtype=np.int32)
+        out_ids = np.empty(out_ptr[-1], dtype=np.int32)
+        for state, ids in self.output.items():
+            out_ids[out_ptr[state]:out_ptr[state + 1]] = ids
+        
+        self.alphabet = np.array([ord(char) for char in alphabet], dtype=np.uint32)
+        self.transitions = transitions
+        self.out_ptr = out_ptr
+        self.out_ids = out_ids
     
     def search(self, text: str) -> List[Dict[str, Any]]:
         """Search for patterns in text"""
-        matches = []
+        return self.matches_to_dicts(*self.search_arrays(text))
+    
+    def search_arrays(self, text: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Search for patterns in text, returning parallel (position, length, pattern id) arrays
+        
+        Matches come in order of end position; pattern ids index into self.patterns.
+        """
+        if self.backend == 'native':
+            ends, pattern_ids = self._search_native(text)
+        elif self.transitions is not None:
+            ends, pattern_ids = self._search_compiled(text)
+        else:
+            ends, pattern_ids = self._search_python(text)
+        
+        lengths = self.pattern_lengths[pattern_ids]
+        return ends - lengths + 1, lengths, pattern_ids
+    
+    def matches_to_dicts(self, positions: np.ndarray, lengths: np.ndarray,
+                         pattern_ids: np.ndarray) -> List[Dict[str, Any]]:
+        """Expand match arrays into the match dicts returned by search"""
+        patterns = self.patterns
+        return [
+            {
+                'pattern': patterns[pattern_id],
+                'position': position,
+                'length': length,
+                'end_position': position + length - 1
+            }
+            for position, length, pattern_id in zip(positions.tolist(), lengths.tolist(), pattern_ids.tolist())
+        ]
+    
+    def _search_python(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Search by walking the dict automaton, returning (end positions, pattern ids)"""
+        ends = []
+        ids = []
+        # Locals avoid repeated attribute lookups in the per-character loop
+        goto, fail, output = self.goto, self.fail, self.output
         current_state = 0
         
         for position, char in enumerate(text):
             # Follow failure links until we find a valid transition
-            while current_state != 0 and char not in self.goto[current_state]:
-                current_state = self.fail[current_state]
+            edges = goto[current_state]
+            while current_state != 0 and char not in edges:
+                current_state = fail[current_state]
+                edges = goto[current_state]
             
-            # Take the goto transition if available
-            if char in self.goto[current_state]:
-                current_state = self.goto[current_state][char]
-            else:
-                current_state = 0  # No transition, go back to start
+            # Take the goto transition if available, else go back to start
+            current_state = edges.get(char, 0)
             
             # Check for matches at current state
-            if self.output[current_state]:
-                for pattern in self.output[current_state]:
-                    start_pos = position - len(pattern) + 1
-                    matches.append({
-                        'pattern': pattern,
-                        'position': start_pos,
-                        'length': len(pattern),
-                        'end_position': position
-                    })
-        
-        return matches
+            state_ids = output.get(current_state)
+            if state_ids:
+                ends.extend([position] * len(state_ids))
+                ids.extend(state_ids)
+        
+        return np.array(ends, dtype=np.int64), np.array(ids, dtype=np.int32)
+    
+    def _search_native(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Search using the pyahocorasick automaton"""
+        if self.native is None:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int32)
+        
+        hits = np.array(list(self.native.iter(text)), dtype=np.int64).reshape(-1, 2)
+        return hits[:, 0], hits[:, 1].astype(np.int32)
+    
+    def _search_compiled(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Search using the Numba-compiled scan over the dense DFA table"""
+        codes = char_codes(text)
+        
+        # Map each character to its table column; unknown characters get the last one
+        alphabet = self.alphabet
+        columns = np.searchsorted(alphabet, codes)
+        known = alphabet[np.minimum(columns, alphabet.size - 1)] == codes if alphabet.size else False
+        columns = np.where(known, columns, alphabet.size).astype(np.intp)
+        return _compiled_scan()(columns, self.transitions, self.out_ptr, self.out_ids)
 
 class PlagiarismDetector:
     """Main plagiarism detection engine"""
@@ -113,18 +333,26 @@ class PlagiarismDetector:
         if not normalized_text:
             return 0.0
         
-        # Count unique character positions to avoid double-counting
-        matched_positions = set()
-        for match in matches:
-            for i in range(match['position'], match['position'] + match['length']):
-                if i < len(normalized_text):
-                    matched_positions.add(i)
+        positions = np.array([match['position'] for match in matches], dtype=np.int64)
+        lengths = np.array([match['length'] for match in matches], dtype=np.int64)
+        return self.similarity_from_arrays(len(normalized_text), positions, lengths)
+    
+    def similarity_from_arrays(self, text_length: int, positions: np.ndarray, lengths: np.ndarray) -> float:
+        """Fraction of the normalized text covered by matches given as position/length arrays"""
+        if not text_length or not len(positions):
+            return 0.0
         
-        total_matched_chars = len(matched_positions)
-        similarity = total_matched_chars / len(normalized_text)
+        # Count each matched character once: +1 where a match starts, -1 where
+        # it ends, and a character is covered while the running sum is positive
+        starts = np.clip(positions, 0, text_length)
+        ends = np.clip(positions + lengths, 0, text_length)
+        keep = ends > starts
+        delta = (np.bincount(starts[keep], minlength=text_length + 1)
+                 - np.bincount(ends[keep], minlength=text_length + 1))
+        covered = np.count_nonzero(np.cumsum(delta[:text_length]) > 0)
         
         # Cap at 100%
-        return min(similarity, 1.0)
+        return min(covered / text_length, 1.0)
     
     def detect_plagiarism(self, suspicious_text: str, source_texts: List[Dict]) -> Dict[str, Any]:
         """Main detection function with better error handling"""
@@ -149,26 +377,49 @@ class PlagiarismDetector:
                     'error': 'Text too short after normalization'
                 }
             
-            # Extract patterns from all source texts
-            all_patterns = []
-            source_mapping = {}
-            
-            for source in source_texts:
-                if not source.get('content'):
-                    continue
-                    
-                normalized_content = self.text_processor.normalize_text(source['content'])
-                if len(normalized_content) < 10:
-                    continue
-                
-                patterns = self.text_processor.create_ngrams(normalized_content, n=6)
-                
-                for pattern in patterns:
-                    if len(pattern) >= 4:  # Minimum pattern length
-                        all_patterns.append(pattern)
-                        source_mapping[pattern] = source.get('topic', 'Unknown')
+            # Fingerprint the suspicious text so source n-grams it cannot
+            # contain are dropped before they reach the automaton
+            suspicious_hashes = np.unique(self.text_processor.ngram_hashes(normalized_suspicious, n=6))
+            
+            # Extract patterns from all source texts; large source sets are
+            # split across worker processes since each source is independent
+            sources = [source for source in source_texts if source.get('content')]
+            extract = partial(_extract_source_patterns, suspicious_hashes=suspicious_hashes, n=6)
+            contents = [source['content'] for source in sources]
+            if len(sources) >= Config.PARALLEL_MIN_SOURCES:
+                extracted = _get_source_pool().map(extract, contents)
+            else:
+                extracted = map(extract, contents)
+            
+            # Count how many sources each candidate occurs in
+            source_patterns = []
+            source_frequency = Counter()
+            patterns_extracted = False
             
-            if not all_patterns:
+            for source, (patterns, any_extracted) in zip(sources, extracted):
+                patterns_extracted = patterns_extracted or any_extracted
+                patterns = list(dict.fromkeys(patterns))
+                source_frequency.update(patterns)
+                source_patterns.append((source.get('topic', 'Unknown'), patterns))
+            
+            # Optionally drop n-grams shared by many sources (stock phrases like
+            # "of the"), but never a source's last candidates; then keep at most
+            # MAX_PATTERNS_PER_SOURCE of the rarest per source. Each pattern
+            # keeps the first source it came from
+            pattern_to_source: Dict[str, str] = {}
+            max_sources = Config.MAX_PATTERN_SOURCES
+            max_patterns = Config.MAX_PATTERNS_PER_SOURCE
+            
+            for topic, patterns in source_patterns:
+                kept = patterns
+                if max_sources is not None:
+                    kept = [pattern for pattern in patterns if source_frequency[pattern] <= max_sources] or patterns
+                if len(kept) > max_patterns:
+                    kept = sorted(kept, key=source_frequency.__getitem__)[:max_patterns]
+                for pattern in kept:
+                    pattern_to_source.setdefault(pattern, topic)
+            
+            if not patterns_extracted:
                 return {
                     'similarity_score': 0.0,
                     'matches': [],
@@ -177,29 +428,44 @@ class PlagiarismDetector:
                     'error': 'No valid patterns extracted from sources'
                 }
             
-            # Remove duplicates and build automaton
-            unique_patterns = list(set(all_patterns))
+            # Build a fresh automaton per analysis, so concurrent analyses
+            # never rebuild one shared automaton underneath each other
+            unique_patterns = list(pattern_to_source)
             print(f"🔍 Building automaton with {len(unique_patterns)} unique patterns...")
             
-            self.automaton.build_automaton(unique_patterns)
+            automaton = AhoCorasickAutomaton()
+            automaton.build_automaton(unique_patterns)
+            self.automaton = automaton
             
-            # Search for matches
-            matches = self.automaton.search(normalized_suspicious)
-            print(f"🔍 Found {len(matches)} potential matches...")
+            # Search for matches, kept as parallel arrays rather than dicts
+            positions, lengths, pattern_ids = automaton.search_arrays(normalized_suspicious)
+            print(f"🔍 Found {len(positions)} potential matches...")
             
-            # Add source information to matches
+            # Calculate similarity score
+            similarity = self.similarity_from_arrays(len(normalized_suspicious), positions, lengths)
+            
+            # Only the returned matches are expanded into dicts with their source
+            positions, lengths, pattern_ids = positions[:40], lengths[:40], pattern_ids[:40]
+            matches = automaton.matches_to_dicts(positions, lengths, pattern_ids)
             for match in matches:
-                pattern = match['pattern']
-                match['source'] = source_mapping.get(pattern, "Unknown")
+                match['source'] = pattern_to_source.get(match['pattern'], "Unknown")
             
-            # Calculate similarity score
-            similarity = self.calculate_similarity(suspicious_text, matches)
+            # Occurrences of each matched pattern, most frequent first (ties alphabetical)
+            matched_ids, id_counts = np.unique(pattern_ids, return_counts=True)
+            pattern_counts = sorted(
+                zip((automaton.patterns[i] for i in matched_ids.tolist()), id_counts.tolist()),
+                key=lambda item: (-item[1], item[0])
+            )
             
             return {
                 'similarity_score': similarity,
-                'matches': matches[:40],  # Limit to first 20 matches for performance
+                'matches': matches,  # Limit to first 40 matches for performance
                 'patterns_used': len(unique_patterns),
                 'normalized_text_length': len(normalized_suspicious),
+                # Statistics of the returned matches, read directly by the report
+                'match_count': len(matches),
+                'match_pattern_total_len': int(lengths.sum()),
+                'pattern_counts': pattern_counts,
                 'error': None
             }
             
@@ -1,8 +1,42 @@
 import wikipedia
+import requests
+import orjson
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from langchain.chat_models import init_chat_model
 from langchain_community.tools import WikipediaQueryRun
 from langchain_community.utilities import WikipediaAPIWrapper
 from utils.config import Config
+from utils.cache import DiskCache, make_cache_key
+
+# Bump when a prompt changes so cached LLM answers to the old prompt are ignored
+PROMPT_VERSION = "1"
+
+# Shared keep-alive session so Wikipedia lookups reuse pooled connections
+# instead of opening a new TCP+TLS connection per request
+_WIKI_SESSION = requests.Session()
+_WIKI_ADAPTER = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3)
+)
+_WIKI_SESSION.mount('https://', _WIKI_ADAPTER)
+_WIKI_SESSION.mount('http://', _WIKI_ADAPTER)
+# The wikipedia package (used by WikipediaAPIWrapper) calls requests.get
+# directly; point it at the pooled session instead. This is process-wide:
+# every user of the wikipedia package in this process goes through the session.
+wikipedia.wikipedia.requests = _WIKI_SESSION
+
+def _use_https_api():
+    """Point the wikipedia package at its https endpoint
+    
+    Its API_URL (and every wikipedia.set_lang call) uses http://, which costs
+    a redirect round trip to https on each request.
+    """
+    if wikipedia.wikipedia.API_URL.startswith('http://'):
+        wikipedia.wikipedia.API_URL = 'https://' + wikipedia.wikipedia.API_URL[len('http://'):]
 
 class LLMIntegration:
     """LLM-powered content collection and analysis"""
@@ -24,10 +58,26 @@ class LLMIntegration:
                 doc_content_chars_max=Config.WIKIPEDIA_MAX_CHARS
             )
         )
+        # The wrapper calls wikipedia.set_lang, which resets the endpoint to http
+        _use_https_api()
+        
+        # On-disk cache of Wikipedia content and topic expansions
+        self.cache = DiskCache(Config.WIKI_CACHE_DIR, ttl=Config.WIKI_CACHE_TTL_SECONDS)
+        
+        # Long-lived pool for concurrent Wikipedia fetches, shared across calls
+        self.fetch_executor = ThreadPoolExecutor(
+            max_workers=Config.WIKIPEDIA_MAX_WORKERS,
+            thread_name_prefix="wiki-fetch"
+        )
     
     def expand_topic(self, topic: str) -> list[str]:
         """Use LLM to find related topics for comprehensive checking"""
         
+        cache_key = f"expand:{Config.LLM_MODEL}:{PROMPT_VERSION}:{topic.strip().lower()}"
+        related_topics = self.cache.get(cache_key)
+        if related_topics is not None:
+            return [topic] + related_topics
+        
         prompt = f"""
         Given the main topic: "{topic}", generate a list of 5-7 closely related 
         subtopics, specific concepts, or alternative phrasings that someone might 
@@ -45,41 +95,98 @@ class LLMIntegration:
             # Extract list from response
             import ast
             related_topics = ast.literal_eval(response.content)
-            return [topic] + related_topics  # Include original topic
+            expanded = [topic] + related_topics  # Include original topic
+            self.cache.set(cache_key, related_topics)  # Only successful parses are cached
+            return expanded
         except:
             # Fallback if LLM fails
             return [topic]
     
+    def detect_and_expand(self, text: str) -> tuple[str, list[str]]:
+        """Detect the main topic of text and its related topics in one LLM call"""
+        
+        cache_key = f"detect:{Config.LLM_MODEL}:{PROMPT_VERSION}:{make_cache_key(text[:300])}"
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached['topic'], [cached['topic']] + cached['related']
+        
+        prompt = f"""
+        Identify the main topic of the following text as a short phrase (2-4 words),
+        then list 5-7 closely related subtopics, specific concepts, or alternative
+        phrasings that someone might use when writing about that topic.
+        Return ONLY a JSON object of the form {{"topic": "...", "related": ["...", "..."]}}.
+        
+        Text: "{text[:300]}..."
+        """
+        
+        try:
+            response = self.llm.invoke(prompt)
+            # Models sometimes wrap the object in prose or code fences
+            content = response.content
+            parsed = orjson.loads(content[content.index('{'):content.rindex('}') + 1])
+            topic = parsed['topic'].strip()
+            related_topics = [str(related) for related in parsed['related']]
+            if topic:
+                self.cache.set(cache_key, {'topic': topic, 'related': related_topics})
+                return topic, [topic] + related_topics
+        except:
+            pass
+        
+        # Fallback if LLM fails
+        topic = "general topic"
+        return topic, self.expand_topic(topic)
+    
     def fetch_wikipedia_content(self, topics: list[str]) -> list[dict]:
         """Fetch content from Wikipedia for given topics"""
         
-        sources = []
-        
+        # Expansions often repeat the main topic; fetch each topic once
+        by_key = {}
         for topic in topics:
-            try:
+            by_key.setdefault(topic.strip().lower(), topic)
+        unique_topics = list(by_key.values())
+        if not unique_topics:
+            return []
+        
+        # Topics are fetched concurrently; results keep the input order
+        results = self.fetch_executor.map(self._fetch_topic, unique_topics)
+        
+        return [source for source in results if source]
+    
+    def _fetch_topic(self, topic: str) -> Optional[dict]:
+        """Fetch Wikipedia content for a single topic"""
+        try:
+            cache_key = f"wiki:{topic.strip().lower()}"
+            content = self.cache.get(cache_key)
+            if content is None:
                 print(f"📚 Fetching Wikipedia content for: {topic}")
                 content = self.wikipedia_tool.invoke({"query": topic})
-                
-                if content and len(content) > 100:  # Minimum content length
-                    sources.append({
-                        'topic': topic,
-                        'content': content,
-                        'source': f"Wikipedia: {topic}",
-                        'length': len(content)
-                    })
-                    print(f"✅ Found content ({len(content)} chars)")
-                else:
-                    print(f"❌ Insufficient content for: {topic}")
-                    
-            except Exception as e:
-                print(f"❌ Error fetching {topic}: {str(e)}")
-                continue
-        
-        return sources
+                self.cache.set(cache_key, content)
+            
+            if content and len(content) > 100:  # Minimum content length
+                print(f"✅ Found content ({len(content)} chars)")
+                return {
+                    'topic': topic,
+                    'content': content,
+                    'source': f"Wikipedia: {topic}",
+                    'length': len(content)
+                }
+            
+            print(f"❌ Insufficient content for: {topic}")
+            
+        except Exception as e:
+            print(f"❌ Error fetching {topic}: {str(e)}")
+        
+        return None
     
     def analyze_writing_style(self, text: str) -> dict:
         """Use LLM to analyze writing style characteristics"""
         
+        # Only the first 500 characters reach the prompt, so they make the key
+        cache_key = f"style:{Config.LLM_MODEL}:{PROMPT_VERSION}:{make_cache_key(text[:500])}"
+        style_analysis = self.cache.get(cache_key)
+        if style_analysis is not None:
+            return {'style_analysis': style_analysis}
+        
         prompt = f"""
         Analyze the following text and identify its key characteristics:
         "{text[:500]}..."  # First 500 chars for analysis
@@ -94,6 +201,7 @@ class LLMIntegration:
         
         try:
             response = self.llm.invoke(prompt)
+            self.cache.set(cache_key, response.content)  # Failures are not cached
             return {'style_analysis': response.content}
         except:
             return {'style_analysis': 'Analysis unavailable'}
@@ -1,25 +1,69 @@
 import re
 import nltk
+import numpy as np
 from typing import List, Set
+from numpy.lib.stride_tricks import sliding_window_view
 from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize, sent_tokenize
+from utils.config import Config
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt', quiet=True)
+# Download required NLTK data (Punkt is only needed for NLTK tokenization)
+if Config.USE_NLTK:
+    try:
+        nltk.data.find('tokenizers/punkt')
+    except LookupError:
+        nltk.download('punkt', quiet=True)
 
 try:
     nltk.data.find('corpora/stopwords')
 except LookupError:
     nltk.download('stopwords', quiet=True)
 
+# Shared by every TextProcessor instead of being rebuilt per instance
+_STOP_WORDS = frozenset(stopwords.words('english'))
+
+# Base for the polynomial n-gram hash; arithmetic wraps modulo 2**64
+_HASH_BASE = np.uint64(1000003)
+
+# Patterns used by normalize_text, compiled once at import
+_WS_RE = re.compile(r'\s+')
+_DISALLOWED_RE = re.compile(r'[^a-zA-Z0-9\s\.\,\;]+')
+
+# Lightweight tokenizers for the phrase builders
+_WORD_RE = re.compile(r'[a-z0-9]+')
+_SENT_RE = re.compile(r'[.!?]+')
+
+
+def char_codes(text: str) -> np.ndarray:
+    """Code points of text as an array, one byte per character when text is ASCII
+    
+    Normalized text is always ASCII, so this skips the 4-byte UTF-32 encoding
+    on the detection path while still handling arbitrary input.
+    """
+    if text.isascii():
+        return np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+
+
+def _words(text: str) -> List[str]:
+    """Lowercased word tokens"""
+    if Config.USE_NLTK:
+        return word_tokenize(text.lower())
+    return _WORD_RE.findall(text.lower())
+
+
+def _sentences(text: str) -> List[str]:
+    """Sentences split on terminal punctuation"""
+    if Config.USE_NLTK:
+        return sent_tokenize(text)
+    return _SENT_RE.split(text)
+
+
 class TextProcessor:
     """Enhanced text preprocessing and phrase extraction"""
     
     def __init__(self):
-        self.stop_words = set(stopwords.words('english'))
+        self.stop_words = _STOP_WORDS
     
     def normalize_text(self, text: str) -> str:
         """Normalize text for comparison"""
@@ -30,25 +74,26 @@ class TextProcessor:
         text = text.lower()
         
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = _WS_RE.sub(' ', text)
         
         # Keep basic punctuation for sentence structure
-        text = re.sub(r'[^a-zA-Z0-9\s\.\,\;]', '', text)
+        text = _DISALLOWED_RE.sub('', text)
         
         return text.strip()
     
     def extract_meaningful_phrases(self, text: str, min_words: int = 3, max_words: int = 8) -> List[str]:
         """Extract meaningful phrases instead of just n-grams"""
         phrases = []
+        stop_words = self.stop_words
         
         # Split into sentences
-        sentences = sent_tokenize(text)
+        sentences = _sentences(text)
         
         for sentence in sentences:
             # Tokenize words
-            words = word_tokenize(sentence.lower())
+            words = _words(sentence)
             # Remove stopwords but keep meaningful words
-            meaningful_words = [word for word in words if word not in self.stop_words and len(word) > 2]
+            meaningful_words = [word for word in words if len(word) > 2 and word not in stop_words]
             
             # Create phrases of different lengths
             for phrase_length in range(min_words, min(max_words + 1, len(meaningful_words) + 1)):
@@ -61,8 +106,9 @@ class TextProcessor:
     
     def create_sliding_window_phrases(self, text: str, window_size: int = 5) -> List[str]:
         """Create overlapping phrases using sliding window"""
-        words = word_tokenize(text.lower())
-        meaningful_words = [word for word in words if word not in self.stop_words and len(word) > 2]
+        words = _words(text)
+        stop_words = self.stop_words
+        meaningful_words = [word for word in words if len(word) > 2 and word not in stop_words]
         
         phrases = []
         for i in range(len(meaningful_words) - window_size + 1):
@@ -77,8 +123,24 @@ class TextProcessor:
         if len(text) < n:
             return [text]
         
-        ngrams = []
-        for i in range(len(text) - n + 1):
-            ngrams.append(text[i:i+n])
+        if '\x00' in text:  # NumPy unicode arrays drop trailing NULs
+            return [text[i:i+n] for i in range(len(text) - n + 1)]
+        
+        # View each window of n code points as one fixed-width numpy string,
+        # so the n-grams are cut in C rather than by a Python slicing loop
+        codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+        windows = np.ascontiguousarray(sliding_window_view(codes, n))
+        return windows.view(f'<U{n}').ravel().tolist()
+    
+    def ngram_hashes(self, text: str, n: int = 6) -> np.ndarray:
+        """Polynomial hashes of the character n-grams, aligned with create_ngrams"""
+        codes = char_codes(text).astype(np.uint64)
+        width = min(n, codes.size)
+        if width == 0:
+            return np.zeros(1, dtype=np.uint64)
         
-        return ngrams
\ No newline at end of file
+        # Hash every window at once: sum(code[i + j] * BASE**(width - 1 - j))
+        powers = np.ones(width, dtype=np.uint64)
+        powers[:-1] = np.cumprod(np.full(width - 1, _HASH_BASE, dtype=np.uint64))[::-1]
+        windows = sliding_window_view(codes, width)
+        return (windows * powers).sum(axis=1, dtype=np.uint64)
\ No newline at end of file
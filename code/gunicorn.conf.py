@@ -0,0 +1,17 @@
+"""
+Gunicorn settings for the plagiarism detection web UI
+"""
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:3000")
+
+# Analyses block on Wikipedia/LLM round-trips, so run several worker
+# processes with a few threads each to keep one slow request from
+# stalling the rest.
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "gthread"
+threads = int(os.getenv("WEB_THREADS", 4))
+
+# Topic expansion plus Wikipedia fetches can take well over the 30s default
+timeout = 120
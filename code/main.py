@@ -7,7 +7,6 @@ Combining LLM + Wikipedia + Automata Theory
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-import json
 from detectors.llm_integration import LLMIntegration
 from detectors.automata_detector import PlagiarismDetector
 from utils.reporting import ReportGenerator
@@ -28,14 +27,15 @@ class PlagiarismDetectionSystem:
         
         print("🚀 Starting Plagiarism Analysis...")
         
-        # If no topic provided, detect it from text
+        # If no topic provided, detect and expand it from text in one LLM call
         if not main_topic:
-            main_topic = self._detect_topic(suspicious_text)
+            main_topic, related_topics = self.llm_integration.detect_and_expand(suspicious_text)
             print(f"🔍 Detected topic: {main_topic}")
+        else:
+            related_topics = self.llm_integration.expand_topic(main_topic)
         
-        # Step 1: Expand topic and fetch Wikipedia content
+        # Step 1: Fetch Wikipedia content for the expanded topics
         print("📖 Gathering relevant source content...")
-        related_topics = self.llm_integration.expand_topic(main_topic)
         source_texts = self.llm_integration.fetch_wikipedia_content(related_topics)
         
         if not source_texts:
@@ -51,23 +51,6 @@ class PlagiarismDetectionSystem:
         report = self.reporter.generate_report(detection_results, suspicious_text, source_texts)
         
         return report
-    
-    def _detect_topic(self, text: str) -> str:
-        """Detect main topic from text using LLM"""
-        prompt = f"""
-        Extract the main topic or subject from the following text. 
-        Return ONLY the topic as a short phrase (2-4 words).
-        
-        Text: "{text[:300]}..."  # First 300 characters
-        
-        Topic:
-        """
-        
-        try:
-            response = self.llm_integration.llm.invoke(prompt)
-            return response.content.strip()
-        except:
-            return "general topic"
 
 def main():
     """Main function with example usage"""
@@ -123,8 +106,7 @@ def main():
             save_report = input("\n💾 Save full report to file? (y/n): ").lower().strip()
             if save_report == 'y':
                 filename = f"plagiarism_report_{report['analysis_date'][:10]}.json"
-                with open(filename, 'w') as f:
-                    json.dump(report, f, indent=2)
+                system.reporter.save(report, filename)
                 print(f"✅ Report saved as {filename}")
         
     except Exception as e:
@@ -3,9 +3,17 @@ Utility Modules for Plagiarism Detection
 """
 
 from .config import Config
-from .reporting import ReportGenerator
+from .reporting import ReportGenerator, PlagiarismReport
+from .cache import LRUCache, TTLCache, DiskCache, make_cache_key
+from .jobs import JobQueue
 
 __all__ = [
     'Config',
-    'ReportGenerator'
+    'ReportGenerator',
+    'PlagiarismReport',
+    'LRUCache',
+    'TTLCache',
+    'DiskCache',
+    'make_cache_key',
+    'JobQueue'
 ]
\ No newline at end of file
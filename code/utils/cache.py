@@ -0,0 +1,147 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+try:
+    import xxhash
+except ImportError:  # xxhash is optional; keys fall back to blake2b
+    xxhash = None
+
+class LRUCache:
+    """Thread-safe in-memory least-recently-used cache"""
+    
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return cached value for key, marking it as recently used"""
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+    
+    def set(self, key: Hashable, value: Any):
+        """Store value, evicting the least recently used entry when full"""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def clear(self):
+        """Drop all cached entries"""
+        with self._lock:
+            self._data.clear()
+    
+    def __len__(self) -> int:
+        return len(self._data)
+
+class TTLCache(LRUCache):
+    """LRU cache whose entries expire after a fixed number of seconds"""
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 86400):
+        super().__init__(maxsize)
+        self.ttl = ttl
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return cached value for key unless it has expired"""
+        entry = super().get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            with self._lock:
+                self._data.pop(key, None)
+            return default
+        return value
+    
+    def set(self, key: Hashable, value: Any):
+        """Store value with an expiry of now + ttl"""
+        super().set(key, (time.monotonic() + self.ttl, value))
+
+class DiskCache:
+    """JSON-file cache on disk whose entries expire after ttl seconds
+    
+    Each key is stored in its own file named by the key's SHA-1, so entries
+    survive restarts and are shared by every process on the machine.
+    """
+    
+    def __init__(self, directory: str, ttl: float = 86400, prune_interval: float = 300):
+        self.directory = os.path.expanduser(directory)
+        self.ttl = ttl
+        self.prune_interval = prune_interval
+        self._last_prune = 0.0
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+        except OSError:
+            pass  # Unwritable location: every lookup simply misses
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.json')
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the stored value for key unless it is missing, unreadable or expired"""
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return default
+        if time.time() - entry.get('stored_at', 0) > self.ttl:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return default
+        return entry.get('value', default)
+    
+    def set(self, key: str, value: Any):
+        """Store a JSON-serializable value; write failures are ignored"""
+        self._prune_expired()
+        try:
+            # Write then rename so readers never see a partial file
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'value': value, 'stored_at': time.time()}, f, ensure_ascii=False)
+            os.replace(temp_path, self._path(key))
+        except OSError:
+            pass
+    
+    def _prune_expired(self):
+        # Entries whose keys are never looked up again would otherwise stay forever;
+        # the sweep stats every file, so it runs at most once per prune_interval
+        now = time.time()
+        if now - self._last_prune < self.prune_interval:
+            return
+        self._last_prune = now
+        cutoff = now - self.ttl
+        try:
+            entries = os.scandir(self.directory)
+        except OSError:
+            return
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                except OSError:
+                    continue
+
+def make_cache_key(*parts: Optional[str]) -> str:
+    """Build a compact digest key from text parts (None is treated as empty)"""
+    # Keys only need to be collision-resistant, not cryptographic
+    digest = xxhash.xxh3_128() if xxhash else hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update((part or "").encode('utf-8'))
+        digest.update(b"\x00")
+    return digest.hexdigest()
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 from nltk.tokenize import word_tokenize
 load_dotenv()
@@ -12,11 +13,30 @@ class Config:
     # Wikipedia Settings
     WIKIPEDIA_MAX_RESULTS = 5
     WIKIPEDIA_MAX_CHARS = 2000
+    WIKIPEDIA_MAX_WORKERS = 8  # Concurrent topic fetches
+    WIKI_CACHE_DIR = os.getenv("PLAGIARISM_CACHE_DIR", "~/.cache/plagiarism_wiki")
+    WIKI_CACHE_TTL_SECONDS = 24 * 60 * 60  # On-disk Wikipedia/topic cache lifetime
     
     # Detection Parameters
     NGRAM_SIZE = 6
     SIMILARITY_THRESHOLD = 0.7
     MIN_MATCH_LENGTH = 10
+    MAX_PATTERNS_PER_SOURCE = 2048  # Candidate n-grams kept per source (rarest first)
+    MAX_PATTERN_SOURCES = None  # Ignore n-grams found in more sources than this (None = keep all; lowers scores)
+    PARALLEL_MIN_SOURCES = 16  # Source count at which extraction uses worker processes
+    DETECTION_WORKERS = 0  # Extraction worker processes (0 = one per CPU)
+    AUTOMATON_BACKEND = os.getenv("PLAGIARISM_AUTOMATON_BACKEND", "native")  # "native" (pyahocorasick), "compiled" (Numba, optional) or "python"
+    USE_NLTK = False  # Tokenize phrases with NLTK Punkt instead of the regex tokenizer
+    
+    # Cache Settings
+    RESULT_CACHE_SIZE = 128  # Completed analyses kept in memory
+    SOURCE_CACHE_SIZE = 1024  # Topic expansions / Wikipedia fetches kept in memory
+    SOURCE_CACHE_TTL = 24 * 60 * 60  # Seconds before cached sources are refetched
+    
+    # Background Analysis Jobs
+    JOB_WORKERS = 4  # Analyses run concurrently per server process
+    JOB_DIR = os.getenv("PLAGIARISM_JOB_DIR", os.path.join(tempfile.gettempdir(), "plagiarism_jobs"))
+    JOB_TTL = 60 * 60  # Seconds a finished job stays available for polling
     
     # LLM Settings
     LLM_MODEL = "qwen2-7b-instruct"  # Free model that works well
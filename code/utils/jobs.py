@@ -0,0 +1,80 @@
+import json
+import os
+import re
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+_JOB_ID_RE = re.compile(r'^[0-9a-f]{32}$')
+
+class JobQueue:
+    """Run analyses in background threads, keeping job state on disk
+    
+    State lives in one JSON file per job, so any server process on the
+    same host can answer a status poll regardless of which one ran the job.
+    """
+    
+    def __init__(self, job_dir: str, max_workers: int = 4, ttl: float = 3600, prune_interval: float = 300):
+        self.job_dir = job_dir
+        self.ttl = ttl
+        self.prune_interval = prune_interval
+        self._last_prune = 0.0
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        os.makedirs(job_dir, exist_ok=True)
+    
+    def submit(self, func: Callable[..., Any], *args) -> str:
+        """Queue func(*args) and return the new job id"""
+        self._prune_expired()
+        job_id = uuid.uuid4().hex
+        self._write(job_id, {'status': 'pending'})
+        self.executor.submit(self._run, job_id, func, args)
+        return job_id
+    
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the stored state for job_id, or None if it is unknown"""
+        if not _JOB_ID_RE.match(job_id):
+            return None
+        try:
+            with open(self._path(job_id), encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+    
+    def _run(self, job_id: str, func: Callable[..., Any], args: tuple):
+        try:
+            self._write(job_id, {'status': 'done', 'result': func(*args)})
+        except Exception as e:
+            self._write(job_id, {'status': 'failed', 'error': f'Analysis failed: {str(e)}'})
+    
+    def _path(self, job_id: str) -> str:
+        return os.path.join(self.job_dir, f"{job_id}.json")
+    
+    def _write(self, job_id: str, state: Dict[str, Any]):
+        # Write then rename so pollers never see a partial file
+        fd, temp_path = tempfile.mkstemp(dir=self.job_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False)
+            os.replace(temp_path, self._path(job_id))
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+    
+    def _prune_expired(self):
+        # The sweep stats every job file, so it runs at most once per prune_interval
+        now = time.time()
+        if now - self._last_prune < self.prune_interval:
+            return
+        self._last_prune = now
+        cutoff = now - self.ttl
+        for entry in os.scandir(self.job_dir):
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError:
+                continue
@@ -1,62 +1,241 @@
-import json
+import bisect
+import heapq
+import sys
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Any
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, Final, Iterable, List, Any, Optional, Tuple, Union
+
+import orjson
+
+# Similarity at or above each threshold moves the report up one risk level
+_RISK_THRESHOLDS: Final = (0.2, 0.5, 0.8)
+_RISK_LEVELS: Final = ("VERY LOW", "LOW", "MEDIUM", "HIGH")
+
+# Horizontal rule framing the printed summary
+_RULE: Final = "=" * 60
+
+# Most frequent patterns listed in the report statistics
+TOP_PATTERNS: Final = 5
+
+# Characters of the suspicious text shown in the report
+PREVIEW_LENGTH: Final = 200
+
+@dataclass(frozen=True)
+class PlagiarismReport:
+    """Immutable plagiarism report; slotted to keep batches of reports small"""
+    __slots__ = ('analysis_date', 'suspicious_text_preview', 'sources_checked', 'overall_similarity',
+                 'risk_level', 'detailed_matches', 'sources_used', 'statistics')
+    
+    analysis_date: str
+    suspicious_text_preview: str
+    sources_checked: int
+    overall_similarity: float
+    risk_level: str
+    detailed_matches: List[Dict]
+    sources_used: List[Dict]
+    statistics: Optional[Dict[str, Any]]
+    
+    def to_dict(self) -> Dict:
+        """Plain dict form used for JSON output and by dict-based callers"""
+        return {
+            "analysis_date": self.analysis_date,
+            "suspicious_text_preview": self.suspicious_text_preview,
+            "sources_checked": self.sources_checked,
+            "overall_similarity": self.overall_similarity,
+            "risk_level": self.risk_level,
+            "detailed_matches": self.detailed_matches,
+            "sources_used": self.sources_used,
+            "statistics": self.statistics
+        }
 
 class ReportGenerator:
     """Generate comprehensive plagiarism reports"""
     
     @staticmethod
-    def generate_report(results: Dict[str, Any], suspicious_text: str, sources: List[Dict]) -> Dict:
-        """Generate a detailed plagiarism report"""
+    def generate_report(results: Dict[str, Any], suspicious_text: Union[str, bytes], sources: Iterable[Dict],
+                        analysis_date: Optional[str] = None, preview: Optional[str] = None, *,
+                        include_statistics: bool = True, include_detailed: bool = True) -> Dict:
+        """Generate a detailed plagiarism report as a dict (see create_report)"""
+        sources_used, sources_checked = ReportGenerator._unique_sources(sources)
+        return ReportGenerator._build_report(results, suspicious_text, sources_used, sources_checked,
+                                             analysis_date, preview, include_statistics, include_detailed)
+    
+    @staticmethod
+    def create_report(results: Dict[str, Any], suspicious_text: Union[str, bytes], sources: Iterable[Dict],
+                      analysis_date: Optional[str] = None, preview: Optional[str] = None, *,
+                      include_statistics: bool = True, include_detailed: bool = True) -> PlagiarismReport:
+        """Generate a detailed plagiarism report
+        
+        sources may be any iterable, including a one-shot generator; it is
+        consumed once, counting sources while deduplicating them.
+        Batch callers can pass one precomputed analysis_date for every report,
+        and callers that already hold a text preview can pass it as preview.
+        Triage callers that only need the score and risk level can turn off
+        include_statistics (statistics becomes None) and include_detailed
+        (detailed_matches becomes empty).
+        """
+        
+        sources_used, sources_checked = ReportGenerator._unique_sources(sources)
+        return PlagiarismReport(**ReportGenerator._build_report(
+            results, suspicious_text, sources_used, sources_checked,
+            analysis_date, preview, include_statistics, include_detailed
+        ))
+    
+    @staticmethod
+    def generate_reports(batch: Iterable[Tuple[Dict[str, Any], Union[str, bytes]]], sources: Iterable[Dict], *,
+                         include_statistics: bool = True, include_detailed: bool = True) -> List[Dict]:
+        """Generate a report dict for each (results, suspicious_text) pair checked against the same sources
         
-        report = {
-            "analysis_date": datetime.now().isoformat(),
-            "suspicious_text_preview": suspicious_text[:200] + "..." if len(suspicious_text) > 200 else suspicious_text,
-            "sources_checked": len(sources),
+        The analysis date and the deduplicated source list are computed once
+        for the batch; each report gets its own copy of the source list, so
+        editing one report never changes the others.
+        """
+        analysis_date = datetime.now().isoformat()
+        sources_used, sources_checked = ReportGenerator._unique_sources(sources)
+        return [
+            ReportGenerator._build_report(results, suspicious_text, list(sources_used), sources_checked,
+                                          analysis_date, None, include_statistics, include_detailed)
+            for results, suspicious_text in batch
+        ]
+    
+    @staticmethod
+    def _build_report(results: Dict[str, Any], suspicious_text: Union[str, bytes], sources_used: List[Dict],
+                      sources_checked: int, analysis_date: Optional[str], preview: Optional[str],
+                      include_statistics: bool, include_detailed: bool) -> Dict:
+        """Assemble the report fields, as a dict, from already deduplicated sources"""
+        matches = results.get("matches", []) or []
+        
+        return {
+            "analysis_date": analysis_date or datetime.now().isoformat(),
+            "suspicious_text_preview": preview if preview is not None else ReportGenerator._preview(suspicious_text),
+            "sources_checked": sources_checked,
             "overall_similarity": results.get("similarity_score", 0),
             "risk_level": ReportGenerator._assess_risk_level(results.get("similarity_score", 0)),
-            "detailed_matches": results.get("matches", []),
-            "sources_used": sources,
-            "statistics": {
-                "total_matches": len(results.get("matches", [])),
-                "unique_patterns_matched": len(set(match['pattern'] for match in results.get("matches", []))),
-                "average_match_length": sum(len(match['pattern']) for match in results.get("matches", [])) / max(1, len(results.get("matches", [])))
-            }
+            "detailed_matches": matches if include_detailed else [],
+            "sources_used": sources_used,
+            "statistics": ReportGenerator._match_statistics(results, matches) if include_statistics else None
         }
+    
+    @staticmethod
+    def _match_statistics(results: Dict[str, Any], matches: List[Dict]) -> Dict[str, Any]:
+        """Summary statistics of the detected matches"""
+        if "match_count" in results:
+            # The detector already counted these while producing the matches
+            match_count: int = results["match_count"]
+            total_length: int = results["match_pattern_total_len"]
+            frequencies: List[Tuple[str, int]] = results["pattern_counts"]
+        else:
+            # Total the lengths in a single pass, interning patterns so
+            # repeated ones share one string object (detector matches already do)
+            match_count = len(matches)
+            total_length = 0
+            for match in matches:
+                pattern = match['pattern'] = sys.intern(match['pattern'])
+                total_length += len(pattern)
+            frequencies = ReportGenerator.pattern_frequencies(matches)
+        
+        return {
+            "total_matches": match_count,
+            "unique_patterns_matched": len(frequencies),
+            "average_match_length": total_length / max(1, match_count),
+            "top_patterns": [
+                {"pattern": pattern, "count": count}
+                for pattern, count in frequencies[:TOP_PATTERNS]
+            ]
+        }
+    
+    @staticmethod
+    def pattern_frequencies(matches: List[Dict]) -> List[Tuple[str, int]]:
+        """(pattern, occurrences) for each distinct matched pattern, most frequent first
+        
+        Ties keep alphabetical order, so the listing is deterministic.
+        """
+        get_pattern = itemgetter('pattern')
+        frequencies = [
+            (pattern, sum(1 for _ in group))
+            for pattern, group in groupby(sorted(matches, key=get_pattern), key=get_pattern)
+        ]
+        frequencies.sort(key=itemgetter(1), reverse=True)
+        return frequencies
+    
+    @staticmethod
+    def _unique_sources(sources: Iterable[Dict]) -> Tuple[List[Dict], int]:
+        """Return (sources without repeats, number of sources seen) in one pass
         
-        return report
+        Repeats share a url or source label; the first of each is kept.
+        """
+        unique: Dict[Any, Dict] = {}
+        count = 0
+        for source in sources:
+            count += 1
+            unique.setdefault(source.get('url') or source.get('source') or id(source), source)
+        return list(unique.values()), count
+    
+    @staticmethod
+    def _preview(text: Union[str, bytes]) -> str:
+        """First PREVIEW_LENGTH characters of text, with "..." if it was cut"""
+        if isinstance(text, (bytes, bytearray, memoryview)):
+            # Decode only the preview bytes, never the whole upload
+            view = memoryview(text)
+            preview = bytes(view[:PREVIEW_LENGTH]).decode('utf-8', 'replace')
+            return preview + "..." if len(view) > PREVIEW_LENGTH else preview
+        if len(text) > PREVIEW_LENGTH:
+            return text[:PREVIEW_LENGTH] + "..."
+        return text
+    
+    @staticmethod
+    def to_json(report: Union[Dict, PlagiarismReport]) -> str:
+        """Serialize a report to a JSON string"""
+        if isinstance(report, PlagiarismReport):
+            report = report.to_dict()
+        return orjson.dumps(report, option=orjson.OPT_SERIALIZE_NUMPY).decode('utf-8')
+    
+    @staticmethod
+    def save(report: Union[Dict, PlagiarismReport], path: str) -> None:
+        """Write a report to path as indented JSON, encoded once and written in one go"""
+        if isinstance(report, PlagiarismReport):
+            report = report.to_dict()
+        data = orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+        with open(path, 'wb', buffering=1 << 20) as f:
+            f.write(data)
     
     @staticmethod
     def _assess_risk_level(similarity: float) -> str:
         """Assess plagiarism risk level"""
-        if similarity >= 0.8:
-            return "HIGH"
-        elif similarity >= 0.5:
-            return "MEDIUM"
-        elif similarity >= 0.2:
-            return "LOW"
-        else:
-            return "VERY LOW"
+        return _RISK_LEVELS[bisect.bisect_right(_RISK_THRESHOLDS, similarity)]
     
     @staticmethod
-    def print_summary(report: Dict):
+    def print_summary(report: Union[Dict, PlagiarismReport]) -> None:
         """Print a user-friendly summary"""
-        print("\n" + "="*60)
-        print("📊 PLAGIARISM DETECTION REPORT")
-        print("="*60)
-        print(f"📅 Analysis Date: {report['analysis_date']}")
-        print(f"🔍 Sources Checked: {report['sources_checked']}")
-        print(f"📈 Overall Similarity: {report['overall_similarity']:.2%}")
-        print(f"⚠️  Risk Level: {report['risk_level']}")
-        #print(f"🔢 Total Matches Found: {report['statistics']['total_matches']}")
-        #print(f"📏 Average Match Length: {report['statistics']['average_match_length']:.1f} chars")
-        print("="*60)
+        if isinstance(report, PlagiarismReport):
+            report = report.to_dict()
+        
+        # Build the whole summary first and write it to stdout once
+        lines: List[str] = [
+            "",
+            _RULE,
+            "📊 PLAGIARISM DETECTION REPORT",
+            _RULE,
+            f"📅 Analysis Date: {report['analysis_date']}",
+            f"🔍 Sources Checked: {report['sources_checked']}",
+            f"📈 Overall Similarity: {report['overall_similarity']:.2%}",
+            f"⚠️  Risk Level: {report['risk_level']}",
+            #f"🔢 Total Matches Found: {report['statistics']['total_matches']}",
+            #f"📏 Average Match Length: {report['statistics']['average_match_length']:.1f} chars",
+            _RULE,
+        ]
         
         # Print detailed matches
-        if report['detailed_matches example']:
-            print("\n📋 DETAILED MATCHES:")
-            for i, match in enumerate(report['detailed_matches'][10:13], 1):  # Show top 5
-                print(f"{i}. Pattern: '{match['pattern']}'")
-                print(f"   Source: {match['source']}")
-                print(f"   Position: {match['position']}")
-                print()
+        if report['detailed_matches']:
+            lines.append("\n📋 DETAILED MATCHES:")
+            # Show the 5 longest matches (earliest first among equal lengths)
+            top = heapq.nlargest(5, report['detailed_matches'], key=lambda match: len(match['pattern']))
+            for i, match in enumerate(top, 1):
+                lines.append(f"{i}. Pattern: '{match['pattern']}'")
+                lines.append(f"   Source: {match['source']}")
+                lines.append(f"   Position: {match['position']}")
+                lines.append("")
+        
+        sys.stdout.write("\n".join(lines) + "\n")
@@ -0,0 +1,9 @@
+"""
+WSGI entrypoint for running the web UI under a production server
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+from app import app
+
+if __name__ == '__main__':
+    app.run()